@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
+from .services import message_encoder
+from .services.admission import AdmissionController, AdmissionError, SessionLimits
 from .services.websocket_service import WebSocketService
 
 # Load environment variables
@@ -13,6 +15,7 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logger.info(f"Using {message_encoder.JSON_BACKEND} message encoder")
 
 app = FastAPI()
 
@@ -26,7 +29,17 @@ app.add_middleware(
 )
 
 # Initialize WebSocket service
-websocket_service = WebSocketService()
+admission = AdmissionController(
+    max_sessions=int(os.getenv("MAX_SESSIONS", "1000")),
+    max_load=float(os.getenv("MAX_PROCESS_LOAD", "0.8")),
+    session_limits=SessionLimits(
+        edit_rate=float(os.getenv("EDIT_RATE", "10")),
+        edit_burst=float(os.getenv("EDIT_BURST", "100")),
+        max_live_cells=int(os.getenv("MAX_LIVE_CELLS", "1000")),
+        tick_budget=float(os.getenv("TICK_BUDGET_MS", "50")) / 1000,
+    ),
+)
+websocket_service = WebSocketService(admission)
 
 
 @app.get("/health")
@@ -42,7 +55,14 @@ async def websocket_endpoint(websocket: WebSocket, channel_code: str, username:
 
         logger.info(f"User {username} connecting to channel {channel_code}")
 
-        channel_code, session = websocket_service.get_or_create_session(channel_code)
+        try:
+            channel_code, session = websocket_service.get_or_create_session(
+                channel_code
+            )
+        except AdmissionError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close()
+            return
         logger.info(f"Session - channel: {channel_code}")
 
         if username in session.users:
@@ -53,17 +73,15 @@ async def websocket_endpoint(websocket: WebSocket, channel_code: str, username:
             await websocket.close()
             return
 
-        user_colors = await session.add_user(username, websocket)
+        await session.add_user(username, websocket)
 
         if channel_code != "new":
             logger.info(f"Sending new channel code {channel_code} to {username}")
             await websocket.send_json({"type": "channel_code", "code": channel_code})
 
-        await session.broadcast({"type": "user_list", "users": user_colors})
-
         while True:
             data = await websocket.receive_json()
-            logger.info(f"Received message from {username}: {data}")
+            logger.debug(f"Received message from {username}: {data}")
             await session.handle_message(username, data)
 
     except WebSocketDisconnect:
@@ -71,18 +89,7 @@ async def websocket_endpoint(websocket: WebSocket, channel_code: str, username:
         if session:
             await session.remove_user(username)
 
-            remaining_users = list(session.users.keys())
-            await session.broadcast(
-                {
-                    "type": "user_list",
-                    "users": [
-                        {"username": user, "color": session.user_colors[user]}
-                        for user in remaining_users
-                    ],
-                }
-            )
-
-            if not remaining_users:
+            if not session.has_users() and not session.has_spectators():
                 websocket_service.remove_session(channel_code)
                 logger.info(f"Removed empty session {channel_code}")
 
@@ -90,10 +97,45 @@ async def websocket_endpoint(websocket: WebSocket, channel_code: str, username:
         logger.error(f"Error in websocket connection: {str(e)}")
         if session:
             await session.remove_user(username)
-            if not session.has_users():
+            if not session.has_users() and not session.has_spectators():
                 websocket_service.remove_session(channel_code)
     finally:
         try:
             await websocket.close()
         except Exception as e:
             logger.error(f"Error closing websocket: {str(e)}")
+
+
+@app.websocket("/watch/{channel_code}")
+async def spectator_endpoint(websocket: WebSocket, channel_code: str):
+    session = None
+    try:
+        await websocket.accept()
+
+        session = websocket_service.get_session(channel_code)
+        if session is None:
+            await websocket.send_json({"type": "error", "message": "Invalid channel"})
+            await websocket.close()
+            return
+
+        await session.add_spectator(websocket)
+
+        # Spectators are read-only; only presence messages are acted upon
+        while True:
+            data = await websocket.receive_json()
+            await session.handle_spectator_message(websocket, data)
+
+    except WebSocketDisconnect:
+        pass
+
+    except Exception as e:
+        logger.error(f"Error in spectator connection: {str(e)}")
+    finally:
+        if session:
+            session.remove_spectator(websocket)
+            if not session.has_users() and not session.has_spectators():
+                websocket_service.remove_session(channel_code)
+        try:
+            await websocket.close()
+        except Exception as e:
+            logger.debug(f"Error closing spectator websocket: {str(e)}")
@@ -0,0 +1,143 @@
+import logging
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionError(Exception):
+    """Raised when the process has no budget left for a new session."""
+
+
+@dataclass
+class SessionLimits:
+    edit_rate: float = 10.0  # place_cell messages per second per user
+    # Bucket capacity; must fit the largest frontend pattern (Pulsar, 48 cells)
+    edit_burst: float = 100.0
+    max_live_cells: int = 1000
+    tick_budget: float = 0.05  # seconds of compute allowed per tick
+    base_tick_interval: float = 1.0
+    max_tick_interval: float = 8.0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """Initialize a token bucket that starts full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def is_full(self) -> bool:
+        """Check whether the bucket has refilled to capacity.
+
+        A full bucket behaves exactly like a new one, so it can be discarded.
+
+        Returns:
+            bool: True if the bucket holds its full capacity
+        """
+        elapsed = time.monotonic() - self.updated
+        return self.tokens + elapsed * self.rate >= self.capacity
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        """Take tokens from the bucket if enough are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            bool: True if the tokens were taken, False if the caller is over rate
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class TickRateController:
+    def __init__(self, budget: float, base_interval: float, max_interval: float):
+        """Initialize the tick rate controller.
+
+        Args:
+            budget: Seconds of compute allowed per tick
+            base_interval: Normal seconds between ticks
+            max_interval: Slowest allowed seconds between ticks
+        """
+        self.budget = budget
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.interval = base_interval
+        self.average_duration = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record how long a tick took and adjust the tick interval.
+
+        Ticks over budget double the interval; ticks well under budget halve
+        it again until it is back at the base interval.
+
+        Args:
+            duration: Seconds spent computing and encoding the tick, excluding
+                the time spent sending it
+        """
+        self.average_duration = 0.8 * self.average_duration + 0.2 * duration
+
+        if duration > self.budget and self.interval < self.max_interval:
+            self.interval = min(self.interval * 2, self.max_interval)
+            logger.warning(
+                f"Tick took {duration * 1000:.1f}ms, "
+                f"slowing tick interval to {self.interval}s"
+            )
+        elif duration < self.budget / 4 and self.interval > self.base_interval:
+            self.interval = max(self.interval / 2, self.base_interval)
+            logger.info(f"Tick cost recovered, tick interval now {self.interval}s")
+
+    @property
+    def load(self) -> float:
+        """Fraction of wall time spent on ticks at the current rate."""
+        return self.average_duration / self.interval
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_load: float = 0.8,
+        session_limits: SessionLimits = None,
+    ):
+        """Initialize the admission controller.
+
+        Args:
+            max_sessions: Maximum number of concurrent sessions in the process
+            max_load: Maximum combined tick load of all sessions, as a fraction
+                of one CPU
+            session_limits: Quotas applied to every session
+        """
+        self.max_sessions = max_sessions
+        self.max_load = max_load
+        self.session_limits = session_limits or SessionLimits()
+
+    def check_new_session(self, session_count: int, load: float) -> None:
+        """Check whether the process can take on another session.
+
+        Args:
+            session_count: Number of sessions currently running
+            load: Combined tick load of the running sessions
+
+        Raises:
+            AdmissionError: If the process budget is exhausted
+        """
+        if session_count >= self.max_sessions:
+            logger.warning(f"Refusing new session: {session_count} sessions running")
+            raise AdmissionError("Server is at capacity")
+        if load >= self.max_load:
+            logger.warning(f"Refusing new session: process load is {load:.2f}")
+            raise AdmissionError("Server is at capacity")
@@ -1,12 +1,15 @@
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class CellUpdate:
+    __slots__ = ("x", "y", "color")
+
     x: int
     y: int
     color: str
@@ -14,6 +17,8 @@ class CellUpdate:
 
 @dataclass
 class CellRemoval:
+    __slots__ = ("x", "y")
+
     x: int
     y: int
 
@@ -22,6 +27,11 @@ def _normalize_color(color: str) -> str:
     return color.upper() if color else color
 
 
+def _is_coordinate(value) -> bool:
+    # bool is a subclass of int but is not a valid coordinate
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 def _average_colors(colors: List[str]) -> str:
     """Calculate the average of multiple hex colors.
 
@@ -51,36 +61,80 @@ def _average_colors(colors: List[str]) -> str:
     return f"#{avg_r:02x}{avg_g:02x}{avg_b:02x}"
 
 
+@lru_cache(maxsize=32)
+def _neighbor_table(width: int, height: int) -> Tuple[Tuple[int, ...], ...]:
+    """Build the flat neighbor-index table for a board size.
+
+    Cell (x, y) lives at index ``y * width + x``; entry ``i`` holds the indices
+    of its up to 8 neighbors, already clipped to the board. Tables are cached
+    per size so every GameLoop with the same dimensions shares one.
+
+    Args:
+        width: Width of the game board
+        height: Height of the game board
+
+    Returns:
+        Tuple of neighbor index tuples, one per cell
+    """
+    table = []
+    for y in range(height):
+        for x in range(width):
+            table.append(
+                tuple(
+                    ny * width + nx
+                    for ny in (y - 1, y, y + 1)
+                    for nx in (x - 1, x, x + 1)
+                    if (nx, ny) != (x, y) and 0 <= nx < width and 0 <= ny < height
+                )
+            )
+    return tuple(table)
+
+
 class GameLoop:
-    def __init__(self, width: int = 50, height: int = 30):
+    def __init__(
+        self, width: int = 50, height: int = 30, max_cells: Optional[int] = None
+    ):
         """Initialize the game loop.
 
         Args:
             width: Width of the game board
             height: Height of the game board
+            max_cells: Maximum number of live cells; births beyond it are dropped
         """
         self.width = width
         self.height = height
+        self.max_cells = max_cells
         self.cells: Dict[Tuple[int, int], str] = {}  # (x, y) -> color
+        self._neighbors = _neighbor_table(width, height)
+        # Reused between generations; only touched entries are ever non-zero
+        self._counts = [0] * (width * height)
         logger.info(f"Game loop initialized with dimensions {width}x{height}")
 
     def is_within_grid(self, x: int, y: int) -> bool:
         """Check if coordinates are within grid bounds."""
         return 0 <= x < self.width and 0 <= y < self.height
 
-    def place_cell(self, x: int, y: int, color: str) -> None:
+    def place_cell(self, x: int, y: int, color: str) -> bool:
         """Place a cell on the board.
 
         Args:
             x: X coordinate
             y: Y coordinate
             color: Color of the cell
+
+        Returns:
+            bool: True if the cell was placed, False if the position is invalid
         """
-        if self.is_within_grid(x, y):
-            logger.info(f"Placing cell at ({x}, {y}) with color {color}")
-            self.cells[(x, y)] = _normalize_color(color)
-        else:
+        if not _is_coordinate(x) or not _is_coordinate(y):
+            logger.warning(f"Attempted to place cell at non-integer ({x!r}, {y!r})")
+            return False
+        if not self.is_within_grid(x, y):
             logger.warning(f"Attempted to place cell outside grid at ({x}, {y})")
+            return False
+
+        logger.debug(f"Placing cell at ({x}, {y}) with color {color}")
+        self.cells[(x, y)] = _normalize_color(color)
+        return True
 
     def remove_cell(self, x: int, y: int) -> None:
         """Remove a cell from the board.
@@ -114,15 +168,10 @@ class GameLoop:
         Returns:
             List of (x, y) tuples for neighboring positions
         """
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if self.is_within_grid(new_x, new_y):
-                    neighbors.append((new_x, new_y))
-        return neighbors
+        if not self.is_within_grid(x, y):
+            return []
+        width = self.width
+        return [(idx % width, idx // width) for idx in self._neighbors[y * width + x]]
 
     def _count_live_neighbors(self, x: int, y: int) -> int:
         """Count the number of live neighbors for a cell.
@@ -134,7 +183,7 @@ class GameLoop:
         Returns:
             Number of live neighboring cells
         """
-        return sum(1 for nx, ny in self._get_neighbors(x, y) if (nx, ny) in self.cells)
+        return sum(1 for pos in self._get_neighbors(x, y) if pos in self.cells)
 
     def _get_neighbor_colors(self, x: int, y: int) -> List[str]:
         """Get the colors of all live neighboring cells.
@@ -147,42 +196,53 @@ class GameLoop:
             List of colors of neighboring cells
         """
         return [
-            self.cells[(nx, ny)]
-            for nx, ny in self._get_neighbors(x, y)
-            if (nx, ny) in self.cells
+            self.cells[pos] for pos in self._get_neighbors(x, y) if pos in self.cells
         ]
 
     def next_generation(self) -> Dict[Tuple[int, int], str]:
-        """Calculate the next generation of cells."""
-        # Get all cells to check (live cells and their neighbors)
-        cells_to_check: Set[Tuple[int, int]] = set()
-
-        # Only check cells that are within the grid
-        for x, y in self.cells.keys():
-            if self.is_within_grid(x, y):
-                cells_to_check.add((x, y))
-                # Only add neighbors that are within the grid
-                for nx, ny in self._get_neighbors(x, y):
-                    if self.is_within_grid(nx, ny):
-                        cells_to_check.add((nx, ny))
+        """Calculate the next generation of cells.
 
-        new_cells: Dict[Tuple[int, int], str] = {}
+        Runs on flat cell indices: every live cell bumps a counter for each of
+        its neighbors, then only the touched counters are evaluated.
+        """
+        width = self.width
+        table = self._neighbors
+        counts = self._counts
+
+        live: Dict[int, str] = {
+            y * width + x: color
+            for (x, y), color in self.cells.items()
+            if self.is_within_grid(x, y)
+        }
 
-        # Check each cell
-        for x, y in cells_to_check:
-            # Since we filtered above, all cells here are within grid
-            live_neighbors = self._count_live_neighbors(x, y)
-            is_alive = (x, y) in self.cells
-
-            # Apply Conway's Game of Life rules
-            if is_alive and live_neighbors in [2, 3]:
-                # Cell survives
-                new_cells[(x, y)] = self.cells[(x, y)]
-            elif not is_alive and live_neighbors == 3:
-                # Cell is born
-                neighbor_colors = self._get_neighbor_colors(x, y)
-                if neighbor_colors:
-                    new_cells[(x, y)] = _average_colors(neighbor_colors)
+        touched: List[int] = []
+        for idx in live:
+            for n in table[idx]:
+                if not counts[n]:
+                    touched.append(n)
+                counts[n] += 1
+
+        new_cells: Dict[Tuple[int, int], str] = {}
+        births: List[int] = []
+
+        # Apply Conway's Game of Life rules
+        for idx in touched:
+            live_neighbors = counts[idx]
+            counts[idx] = 0
+            if idx in live:
+                if live_neighbors in (2, 3):
+                    # Cell survives
+                    new_cells[(idx % width, idx // width)] = live[idx]
+            elif live_neighbors == 3:
+                births.append(idx)
+
+        # Survivors always fit, births only while there is room under the cap
+        if self.max_cells is not None:
+            births = births[: max(self.max_cells - len(new_cells), 0)]
+
+        for idx in births:
+            color = _average_colors([live[n] for n in table[idx] if n in live])
+            new_cells[(idx % width, idx // width)] = color
 
         return new_cells
 
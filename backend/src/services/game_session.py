@@ -1,10 +1,13 @@
 import asyncio
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Set
 
 from fastapi import WebSocket
 
-from .game_loop import GameLoop
+from . import message_encoder
+from .admission import SessionLimits, TickRateController, TokenBucket
+from .game_loop import GameLoop, _is_coordinate
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +26,54 @@ COLORS = [
     "#7B68EE",
 ]
 
+# Seconds to wait before sending user_list, so bursts of joins/leaves share one
+USER_LIST_DEBOUNCE = 0.25
+
+# Messages buffered per spectator; a spectator that falls this far behind is
+# dropped so it cannot hold back the tick loop or other viewers
+SPECTATOR_QUEUE_SIZE = 16
+# Seconds a single send to a spectator may take before it is dropped
+SPECTATOR_SEND_TIMEOUT = 5.0
+
 
 class GameSession:
-    def __init__(self):
-        """Initialize a new game session."""
+    def __init__(self, limits: SessionLimits = None):
+        """Initialize a new game session.
+
+        Args:
+            limits: Quotas for edits, live cells and tick cost
+        """
+        self.limits = limits or SessionLimits()
         self.users: Dict[str, WebSocket] = {}
         self.user_colors: Dict[str, str] = {}
-        self.game_loop = GameLoop()
+        # Users whose client reported the game as hidden (e.g. background tab)
+        self.hidden_users: Set[str] = set()
+        # Read-only connections keyed by id(), since WebSocket is unhashable.
+        # They get no username, color or user_list entry.
+        self.spectators: Dict[int, WebSocket] = {}
+        # Outbound queue per spectator, drained by its own writer task
+        self._spectator_queues: Dict[int, asyncio.Queue] = {}
+        self._spectator_writers: Dict[int, asyncio.Task] = {}
+        # Strong references to close() tasks for dropped spectators
+        self._closing_tasks: Set[asyncio.Task] = set()
+        self.hidden_spectators: Set[int] = set()
+        # Viewers that became visible again and get a snapshot on the next tick.
+        # Coalescing these caps catch-up snapshots at one per viewer per tick.
+        self.catch_up_users: Set[str] = set()
+        self.catch_up_spectators: Set[int] = set()
+        self._user_list_task = None
+        self._viewers_present = asyncio.Event()
+        # Kept after a user leaves until refilled, so reconnecting does not
+        # reset the edit rate limit
+        self.edit_buckets: Dict[str, TokenBucket] = {}
+        # Users already told that their edits are being dropped
+        self.throttled_users: Set[str] = set()
+        self.tick_rate = TickRateController(
+            self.limits.tick_budget,
+            self.limits.base_tick_interval,
+            self.limits.max_tick_interval,
+        )
+        self.game_loop = GameLoop(max_cells=self.limits.max_live_cells)
         self.game_task = None
         self.running = False
         logger.info("New game session created")
@@ -42,9 +86,7 @@ class GameSession:
             self.user_colors[username] = color
             return color
 
-    async def add_user(
-        self, username: str, websocket: WebSocket
-    ) -> List[Dict[str, str]]:
+    async def add_user(self, username: str, websocket: WebSocket) -> None:
         """Add a user to the session.
 
         Args:
@@ -53,19 +95,24 @@ class GameSession:
         """
         self.set_and_get_user_color(username)
         self.users[username] = websocket
+        self._update_viewers()
         logger.info(f"User {username} joined the session")
 
         if not self.running:
             await self.start_game()
 
-        # Send current game state to the new user
+        # Send current game state and user list to the new user right away;
+        # only the broadcast to everyone else is debounced
         await self.send_game_state(username)
-
-        # Return list of user color dictionaries
-        return [
-            {"username": user, "color": color}
-            for user, color in self.user_colors.items()
-        ]
+        try:
+            await websocket.send_text(
+                message_encoder.encode_message(
+                    {"type": "user_list", "users": self.get_user_list()}
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error sending user list to {username}: {str(e)}")
+        self.schedule_user_list()
 
     async def remove_user(self, username: str) -> None:
         """Remove a user from the session.
@@ -76,6 +123,160 @@ class GameSession:
         if username in self.users:
             logger.info(f"User {username} left the session")
             del self.users[username]
+            self._expire_edit_buckets()
+            self.throttled_users.discard(username)
+            self.hidden_users.discard(username)
+            self.catch_up_users.discard(username)
+            self._update_viewers()
+            self.schedule_user_list()
+
+    async def add_spectator(self, websocket: WebSocket) -> None:
+        """Add a read-only spectator to the session.
+
+        Args:
+            websocket: Spectator's WebSocket connection
+        """
+        key = id(websocket)
+        self.spectators[key] = websocket
+        self._spectator_queues[key] = asyncio.Queue(maxsize=SPECTATOR_QUEUE_SIZE)
+        self._spectator_writers[key] = asyncio.create_task(
+            self._write_to_spectator(websocket)
+        )
+        self._update_viewers()
+        logger.debug(f"Spectator joined, {len(self.spectators)} watching")
+
+        self._queue_for_spectator(
+            key, message_encoder.encode_full_update(self.game_loop.cells)
+        )
+        self._queue_for_spectator(
+            key,
+            message_encoder.encode_message(
+                {"type": "user_list", "users": self.get_user_list()}
+            ),
+        )
+
+    def remove_spectator(self, websocket: WebSocket) -> None:
+        """Remove a spectator from the session.
+
+        Args:
+            websocket: Spectator's WebSocket connection
+        """
+        key = id(websocket)
+        if key in self.spectators:
+            del self.spectators[key]
+            del self._spectator_queues[key]
+            writer = self._spectator_writers.pop(key)
+            if writer is not asyncio.current_task():
+                writer.cancel()
+            self.hidden_spectators.discard(key)
+            self.catch_up_spectators.discard(key)
+            self._update_viewers()
+            logger.debug(f"Spectator left, {len(self.spectators)} watching")
+
+    async def _write_to_spectator(self, websocket: WebSocket) -> None:
+        """Drain one spectator's queue, dropping the spectator if a send stalls.
+
+        Args:
+            websocket: Spectator's WebSocket connection
+        """
+        queue = self._spectator_queues[id(websocket)]
+        try:
+            while True:
+                payload = await queue.get()
+                await asyncio.wait_for(
+                    websocket.send_text(payload), SPECTATOR_SEND_TIMEOUT
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Removing spectator after failed send: {e!r}")
+            self.remove_spectator(websocket)
+            await self._close_spectator(websocket)
+
+    def _queue_for_spectator(self, key: int, payload: str) -> None:
+        """Queue a payload for one spectator, dropping the spectator if lagging.
+
+        Args:
+            key: Spectator key, id() of its WebSocket
+            payload: JSON text produced by the message encoder
+        """
+        try:
+            self._spectator_queues[key].put_nowait(payload)
+        except asyncio.QueueFull:
+            websocket = self.spectators[key]
+            logger.info("Dropping spectator that is falling behind")
+            self.remove_spectator(websocket)
+            task = asyncio.create_task(self._close_spectator(websocket))
+            self._closing_tasks.add(task)
+            task.add_done_callback(self._closing_tasks.discard)
+
+    async def _close_spectator(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(), SPECTATOR_SEND_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Error closing spectator websocket: {e!r}")
+
+    async def handle_spectator_message(self, websocket: WebSocket, data: dict) -> None:
+        """Handle a message from a spectator.
+
+        Spectators are read-only, so only presence messages are accepted.
+
+        Args:
+            websocket: Spectator's WebSocket connection
+            data: Message data
+        """
+        if data.get("type") != "presence":
+            return
+
+        visible = data.get("visible")
+        if isinstance(visible, bool):
+            self.set_spectator_visibility(websocket, visible)
+        else:
+            logger.debug(f"Invalid presence message from spectator: {data}")
+
+    def set_spectator_visibility(self, websocket: WebSocket, visible: bool) -> None:
+        """Update whether a spectator is currently viewing the game.
+
+        Works like set_user_visibility.
+
+        Args:
+            websocket: Spectator's WebSocket connection
+            visible: Whether the spectator's client is showing the game
+        """
+        key = id(websocket)
+        if key not in self.spectators:
+            return
+
+        if visible:
+            if key not in self.hidden_spectators:
+                return
+            self.hidden_spectators.discard(key)
+            self.catch_up_spectators.add(key)
+        else:
+            self.hidden_spectators.add(key)
+            self.catch_up_spectators.discard(key)
+        self._update_viewers()
+
+    def get_user_list(self) -> List[Dict[str, str]]:
+        """Get the connected users and their colors.
+
+        Returns:
+            List of dictionaries with username and color
+        """
+        return [
+            {"username": user, "color": self.user_colors[user]} for user in self.users
+        ]
+
+    def schedule_user_list(self) -> None:
+        """Broadcast the user list shortly, batching any changes made meanwhile."""
+        if self._user_list_task is None:
+            self._user_list_task = asyncio.create_task(self._send_user_list())
+
+    async def _send_user_list(self) -> None:
+        await asyncio.sleep(USER_LIST_DEBOUNCE)
+        # Changes from here on schedule a fresh broadcast
+        self._user_list_task = None
+        await self.broadcast({"type": "user_list", "users": self.get_user_list()})
 
     def has_users(self) -> bool:
         """Check if the session has any users.
@@ -85,6 +286,63 @@ class GameSession:
         """
         return len(self.users) > 0
 
+    def has_spectators(self) -> bool:
+        """Check if the session has any spectators.
+
+        Returns:
+            bool: True if there are spectators, False otherwise
+        """
+        return len(self.spectators) > 0
+
+    def has_visible_users(self) -> bool:
+        """Check if anyone is currently viewing the game.
+
+        Returns:
+            bool: True if a user or spectator is not hidden, False otherwise
+        """
+        visible_users = len(self.users) - len(self.hidden_users)
+        visible_spectators = len(self.spectators) - len(self.hidden_spectators)
+        return visible_users > 0 or visible_spectators > 0
+
+    @property
+    def tick_load(self) -> float:
+        """Fraction of wall time this session spends computing ticks."""
+        if not self.running or not self._viewers_present.is_set():
+            return 0.0
+        return self.tick_rate.load
+
+    def _update_viewers(self) -> None:
+        if self.has_visible_users():
+            self._viewers_present.set()
+        else:
+            self._viewers_present.clear()
+
+    def set_user_visibility(self, username: str, visible: bool) -> None:
+        """Update whether a user is currently viewing the game.
+
+        Hidden users stop receiving cell diffs. When they become visible again
+        they are sent a full snapshot on the next tick to catch up on what they
+        missed, so toggling visibility cannot trigger more than one per tick.
+
+        Args:
+            username: User's identifier
+            visible: Whether the user's client is showing the game
+        """
+        if username not in self.users:
+            return
+
+        if visible:
+            if username not in self.hidden_users:
+                return
+            self.hidden_users.discard(username)
+            self.catch_up_users.add(username)
+            logger.debug(f"User {username} is visible again")
+        else:
+            self.hidden_users.add(username)
+            self.catch_up_users.discard(username)
+            logger.debug(f"User {username} is hidden")
+        self._update_viewers()
+
     async def handle_message(self, username: str, data: dict) -> None:
         """Handle a message from a user.
 
@@ -101,40 +359,147 @@ class GameSession:
             x = data.get("x")
             y = data.get("y")
             color = data.get("color")
-            if x is not None and y is not None and color is not None:
-                self.game_loop.place_cell(x, y, self.user_colors[username])
+            if _is_coordinate(x) and _is_coordinate(y) and color is not None:
+                if not self._admit_edit(username, x, y):
+                    await self._notify_dropped_edit(username)
+                    return
+                self.throttled_users.discard(username)
+                if not self.game_loop.place_cell(x, y, self.user_colors[username]):
+                    return
                 await self.broadcast(
-                    {"type": "cell_update", "x": x, "y": y, "color": color}
+                    {"type": "cell_update", "x": x, "y": y, "color": color},
+                    visible_only=True,
                 )
             else:
                 logger.error(f"Invalid place_cell message from {username}: {data}")
+        elif message_type == "presence":
+            visible = data.get("visible")
+            if isinstance(visible, bool):
+                self.set_user_visibility(username, visible)
+            else:
+                logger.error(f"Invalid presence message from {username}: {data}")
+
+    def _expire_edit_buckets(self) -> None:
+        """Drop buckets of departed users once they have fully refilled."""
+        expired = [
+            username
+            for username, bucket in self.edit_buckets.items()
+            if username not in self.users and bucket.is_full()
+        ]
+        for username in expired:
+            del self.edit_buckets[username]
+
+    def _admit_edit(self, username: str, x: int, y: int) -> bool:
+        """Check an edit against the user's rate limit and the live cell cap.
+
+        Args:
+            username: User's identifier
+            x: X coordinate
+            y: Y coordinate
+
+        Returns:
+            bool: True if the edit may be applied, False if it should be dropped
+        """
+        bucket = self.edit_buckets.get(username)
+        if bucket is None:
+            bucket = TokenBucket(self.limits.edit_rate, self.limits.edit_burst)
+            self.edit_buckets[username] = bucket
+        if not bucket.try_consume():
+            logger.debug(f"Dropping place_cell from {username}: edit rate exceeded")
+            return False
+
+        cells = self.game_loop.cells
+        if len(cells) >= self.limits.max_live_cells and (x, y) not in cells:
+            logger.debug(f"Dropping place_cell from {username}: live cell cap reached")
+            return False
+
+        return True
+
+    async def _notify_dropped_edit(self, username: str) -> None:
+        """Tell a user their edits are being dropped, once per throttled burst.
+
+        Args:
+            username: User's identifier
+        """
+        if username in self.throttled_users or username not in self.users:
+            return
+        self.throttled_users.add(username)
+
+        payload = message_encoder.encode_message(
+            {
+                "type": "error",
+                "message": "Edit dropped: too many edits or the board is full",
+            }
+        )
+        try:
+            await self.users[username].send_text(payload)
+        except Exception as e:
+            logger.error(f"Error notifying {username} of dropped edit: {str(e)}")
+
+    async def broadcast(self, message: dict, visible_only: bool = False) -> None:
+        """Broadcast a message to all users.
+
+        Args:
+            message: Message data
+            visible_only: Skip users whose client is hidden
+        """
+        await self.broadcast_encoded(
+            message_encoder.encode_message(message), visible_only
+        )
+
+    async def broadcast_encoded(self, payload: str, visible_only: bool = False) -> None:
+        """Broadcast an already encoded message to all users and spectators.
+
+        Args:
+            payload: JSON text produced by the message encoder
+            visible_only: Skip users whose client is hidden or who are waiting
+                for a catch-up snapshot
+        """
+        if self.spectators:
+            self._send_to_spectators(payload, visible_only)
 
-    async def broadcast(self, message: dict) -> None:
         disconnected_users = []
-        for username, websocket in self.users.items():
+        for username, websocket in list(self.users.items()):
+            if visible_only and (
+                username in self.hidden_users or username in self.catch_up_users
+            ):
+                continue
             try:
-                await websocket.send_json(message)
+                await websocket.send_text(payload)
             except Exception as e:
                 logger.error(f"Error broadcasting to {username}: {str(e)}")
                 disconnected_users.append(username)
 
         for username in disconnected_users:
             logger.info(f"Removing disconnected user: {username}")
-            self.remove_user(username)
+            await self.remove_user(username)
+
+    def _send_to_spectators(self, payload: str, visible_only: bool = False) -> None:
+        """Queue one encoded payload for every spectator.
+
+        Sending happens in each spectator's writer task, so a slow spectator
+        never holds up the caller or the other viewers.
+
+        Args:
+            payload: JSON text produced by the message encoder
+            visible_only: Skip spectators whose client is hidden or who are
+                waiting for a catch-up snapshot
+        """
+        for key in list(self.spectators):
+            if visible_only and (
+                key in self.hidden_spectators or key in self.catch_up_spectators
+            ):
+                continue
+            self._queue_for_spectator(key, payload)
 
     async def broadcast_game_state(self) -> None:
         """Broadcast the current game state to all users."""
-        if not self.users:
+        if not self.users and not self.spectators:
             return
 
-        state = self.game_loop.get_state()
-        message = {"type": "full_update", "state": state}
-
-        for websocket in self.users.values():
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting game state: {str(e)}")
+        await self.broadcast_encoded(
+            message_encoder.encode_full_update(self.game_loop.cells), visible_only=True
+        )
 
     async def send_game_state(self, username: str) -> None:
         """Send the current game state to a specific user.
@@ -145,14 +510,37 @@ class GameSession:
         if username not in self.users:
             return
 
-        state = self.game_loop.get_state()
-        message = {"type": "full_update", "state": state}
+        payload = message_encoder.encode_full_update(self.game_loop.cells)
 
         try:
-            await self.users[username].send_json(message)
+            await self.users[username].send_text(payload)
         except Exception as e:
             logger.error(f"Error sending game state to {username}: {str(e)}")
 
+    async def _send_catch_up(self) -> None:
+        """Send one snapshot to every viewer that became visible since last tick."""
+        if not self.catch_up_users and not self.catch_up_spectators:
+            return
+
+        payload = message_encoder.encode_full_update(self.game_loop.cells)
+        usernames = list(self.catch_up_users)
+        spectators = [key for key in self.catch_up_spectators if key in self.spectators]
+        self.catch_up_users.clear()
+        self.catch_up_spectators.clear()
+
+        for username in usernames:
+            websocket = self.users.get(username)
+            if websocket is None:
+                continue
+            try:
+                await websocket.send_text(payload)
+            except Exception as e:
+                logger.error(f"Error sending game state to {username}: {str(e)}")
+                await self.remove_user(username)
+
+        for key in spectators:
+            self._queue_for_spectator(key, payload)
+
     def start_game_loop(self) -> None:
         """Start the game loop."""
         if not self.running:
@@ -161,7 +549,10 @@ class GameSession:
             logger.info("Game loop started")
 
     def stop_game_loop(self) -> None:
-        """Stop the game loop."""
+        """Stop the game loop and any pending user list broadcast."""
+        if self._user_list_task:
+            self._user_list_task.cancel()
+            self._user_list_task = None
         if self.running:
             self.running = False
             if self.game_task:
@@ -172,24 +563,25 @@ class GameSession:
         """Run the game loop."""
         while self.running:
             try:
+                if not self._viewers_present.is_set():
+                    # Nobody is watching: pause until a user becomes visible
+                    logger.info("No visible users, pausing game loop")
+                    await self._viewers_present.wait()
+                    logger.info("Visible user returned, resuming game loop")
+
+                started = time.perf_counter()
                 updates, removals = self.game_loop.update_game_state()
+                payloads = []
                 if updates:
-                    await self.broadcast(
-                        {
-                            "type": "cell_updates",
-                            "updates": [
-                                {"x": u.x, "y": u.y, "color": u.color} for u in updates
-                            ],
-                        }
-                    )
+                    payloads.append(message_encoder.encode_cell_updates(updates))
                 if removals:
-                    await self.broadcast(
-                        {
-                            "type": "cell_removals",
-                            "removals": [{"x": r.x, "y": r.y} for r in removals],
-                        }
-                    )
-                await asyncio.sleep(1)  # Update every second
+                    payloads.append(message_encoder.encode_cell_removals(removals))
+                self.tick_rate.record(time.perf_counter() - started)
+
+                for payload in payloads:
+                    await self.broadcast_encoded(payload, visible_only=True)
+                await self._send_catch_up()
+                await asyncio.sleep(self.tick_rate.interval)
             except Exception as e:
                 logger.error(f"Error in game loop: {str(e)}")
                 await asyncio.sleep(1)  # Wait before retrying
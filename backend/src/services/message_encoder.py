@@ -0,0 +1,92 @@
+import json
+from typing import Any, Dict, Iterable, Tuple
+
+from .game_loop import CellRemoval, CellUpdate, _normalize_color
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _stdlib_dumps(message: Dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+def _orjson_dumps(message: Dict[str, Any]) -> str:
+    return orjson.dumps(message).decode()
+
+
+# Name of the JSON backend in use, logged by the app at startup
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+_dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Encode an arbitrary outbound message.
+
+    Args:
+        message: Message dictionary
+
+    Returns:
+        JSON text ready to be sent over a WebSocket
+    """
+    return _dumps(message)
+
+
+def encode_cell_updates(updates: Iterable[CellUpdate]) -> str:
+    """Encode a cell_updates message without building per-cell dictionaries.
+
+    The payload is built from string fragments rather than through the JSON
+    backend. Coordinates are formatted with ":d" so they are always integers.
+
+    Args:
+        updates: Cells that were born or changed color
+
+    Returns:
+        JSON text ready to be sent over a WebSocket
+    """
+    return (
+        '{"type":"cell_updates","updates":['
+        + ",".join(f'{{"x":{u.x:d},"y":{u.y:d},"color":"{u.color}"}}' for u in updates)
+        + "]}"
+    )
+
+
+def encode_cell_removals(removals: Iterable[CellRemoval]) -> str:
+    """Encode a cell_removals message without building per-cell dictionaries.
+
+    Built from string fragments like encode_cell_updates.
+
+    Args:
+        removals: Cells that died
+
+    Returns:
+        JSON text ready to be sent over a WebSocket
+    """
+    return (
+        '{"type":"cell_removals","removals":['
+        + ",".join(f'{{"x":{r.x:d},"y":{r.y:d}}}' for r in removals)
+        + "]}"
+    )
+
+
+def encode_full_update(cells: Dict[Tuple[int, int], str]) -> str:
+    """Encode a full_update message straight from the board's cell map.
+
+    Built from string fragments like encode_cell_updates.
+
+    Args:
+        cells: Mapping of (x, y) to cell color, as held by GameLoop
+
+    Returns:
+        JSON text ready to be sent over a WebSocket
+    """
+    return (
+        '{"type":"full_update","state":['
+        + ",".join(
+            f'{{"x":{x:d},"y":{y:d},"color":"{_normalize_color(color)}"}}'
+            for (x, y), color in cells.items()
+        )
+        + "]}"
+    )
@@ -1,16 +1,22 @@
 import logging
 import random
 import string
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
+from .admission import AdmissionController
 from .game_session import GameSession
 
 logger = logging.getLogger(__name__)
 
 
 class WebSocketService:
-    def __init__(self):
-        """Initialize the WebSocket service."""
+    def __init__(self, admission: AdmissionController = None):
+        """Initialize the WebSocket service.
+
+        Args:
+            admission: Process-wide budget for new sessions
+        """
+        self.admission = admission or AdmissionController()
         self.sessions: Dict[str, GameSession] = {}
         logger.info("WebSocket service initialized")
 
@@ -22,23 +28,47 @@ class WebSocketService:
 
         Returns:
             GameSession: The game session instance
+
+        Raises:
+            AdmissionError: If a new session is requested but the process
+                budget is exhausted
         """
         if channel_code.lower() == "new":
+            self.admission.check_new_session(len(self.sessions), self.total_load())
             while True:
                 new_code = "".join(
                     random.choices(string.ascii_uppercase + string.digits, k=6)
                 )
                 if new_code not in self.sessions:
-                    self.sessions[new_code] = GameSession()
+                    self.sessions[new_code] = GameSession(self.admission.session_limits)
                     return new_code, self.sessions[new_code]
 
-        logger.info(self.sessions)
+        logger.debug(self.sessions)
 
         if channel_code in self.sessions:
             return channel_code, self.sessions[channel_code]
         else:
             raise ValueError("Invalid channel code")
 
+    def get_session(self, channel_code: str) -> Optional[GameSession]:
+        """Get an existing session without creating one.
+
+        Args:
+            channel_code: Unique identifier for the game session
+
+        Returns:
+            GameSession: The game session instance, or None if it does not exist
+        """
+        return self.sessions.get(channel_code)
+
+    def total_load(self) -> float:
+        """Get the combined tick load of all sessions.
+
+        Returns:
+            float: Sum of each session's fraction of wall time spent on ticks
+        """
+        return sum(session.tick_load for session in self.sessions.values())
+
     def remove_session(self, channel_code: str) -> None:
         """Remove a game session.
 
@@ -0,0 +1,75 @@
+import pytest
+from src.services.admission import (
+    AdmissionController,
+    AdmissionError,
+    TickRateController,
+    TokenBucket,
+)
+
+
+def test_token_bucket_allows_burst_then_limits():
+    """Test that a bucket allows its capacity in a burst and then refuses."""
+    bucket = TokenBucket(rate=0.001, capacity=3)
+    assert all(bucket.try_consume() for _ in range(3))
+    assert not bucket.try_consume()
+
+
+def test_token_bucket_refills(monkeypatch):
+    """Test that tokens are refilled over time up to the capacity."""
+    now = [100.0]
+    monkeypatch.setattr("src.services.admission.time.monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.try_consume(2)
+    assert not bucket.try_consume()
+
+    now[0] += 0.5
+    assert bucket.try_consume()
+    assert not bucket.try_consume()
+
+    # Refill is capped at the capacity
+    now[0] += 10
+    assert bucket.try_consume(2)
+    assert not bucket.try_consume()
+
+
+def test_token_bucket_is_full(monkeypatch):
+    """Test that a bucket reports full only once it has refilled."""
+    now = [100.0]
+    monkeypatch.setattr("src.services.admission.time.monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.is_full()
+
+    bucket.try_consume(2)
+    now[0] += 1
+    assert not bucket.is_full()
+    now[0] += 1
+    assert bucket.is_full()
+
+
+def test_tick_rate_slows_down_and_recovers():
+    """Test that slow ticks reduce the tick rate and fast ones restore it."""
+    tick_rate = TickRateController(budget=0.05, base_interval=1.0, max_interval=4.0)
+
+    tick_rate.record(0.1)
+    assert tick_rate.interval == 2.0
+    tick_rate.record(0.1)
+    tick_rate.record(0.1)
+    assert tick_rate.interval == 4.0
+
+    tick_rate.record(0.03)
+    assert tick_rate.interval == 4.0
+    tick_rate.record(0.001)
+    tick_rate.record(0.001)
+    tick_rate.record(0.001)
+    assert tick_rate.interval == 1.0
+
+
+def test_admission_refuses_when_budget_exhausted():
+    """Test that new sessions are refused once the process budget is used."""
+    admission = AdmissionController(max_sessions=2, max_load=0.5)
+    admission.check_new_session(1, 0.1)
+
+    with pytest.raises(AdmissionError):
+        admission.check_new_session(2, 0.1)
+    with pytest.raises(AdmissionError):
+        admission.check_new_session(1, 0.5)
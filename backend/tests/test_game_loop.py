@@ -200,3 +200,69 @@ def test_beacon_pattern_updates_and_removals(game):
     assert len(removals) == 2
     assert CellRemoval(2,2) in removals
     assert CellRemoval(3,3) in removals
+
+
+def test_neighbor_table_shared_between_same_size_games():
+    """Test that games with the same dimensions share one neighbor table."""
+    first = GameLoop(width=10, height=10)
+    second = GameLoop(width=10, height=10)
+    other = GameLoop(width=12, height=10)
+
+    assert first._neighbors is second._neighbors
+    assert first._neighbors is not other._neighbors
+
+
+def test_neighbors_clipped_to_grid(game):
+    """Test that neighbor lookups never leave the board."""
+    assert sorted(game._get_neighbors(0, 0)) == [(0, 1), (1, 0), (1, 1)]
+    assert len(game._get_neighbors(5, 0)) == 5
+    assert len(game._get_neighbors(5, 5)) == 8
+    assert game._get_neighbors(15, 15) == []
+
+
+def test_glider_at_edge(game):
+    """Test that a glider running into the corner is clipped, not wrapped."""
+    # Glider heading towards the bottom-right corner
+    for x, y in [(8, 7), (9, 8), (7, 9), (8, 9), (9, 9)]:
+        game.place_cell(x, y, "#FF0000")
+
+    new_state = game.next_generation()
+
+    assert set(new_state) == {(7, 8), (9, 8), (8, 9), (9, 9)}
+    assert all(0 <= x < 10 and 0 <= y < 10 for x, y in new_state)
+
+
+@pytest.mark.parametrize("x, y", [(1.5, 2), (2, 1.0), (True, 2), (2, False), ("1", 2)])
+def test_place_cell_rejects_non_integer_coordinates(game, x, y):
+    """Test that non-integer coordinates are rejected instead of breaking ticks."""
+    assert game.place_cell(x, y, "#FF0000") is False
+    assert len(game.cells) == 0
+
+    # The engine keeps working after the rejected placement
+    game.place_cell(2, 1, "#FF0000")
+    game.place_cell(2, 2, "#FF0000")
+    game.place_cell(2, 3, "#FF0000")
+    updates, removals = game.update_game_state()
+    assert len(updates) == 2
+    assert len(removals) == 2
+
+
+def test_max_cells_limits_births():
+    """Test that births stop at the live cell cap while survivors are kept."""
+    game = GameLoop(width=10, height=10, max_cells=6)
+    # Blinker: one survivor and two births each generation
+    game.place_cell(2, 1, "#FF0000")
+    game.place_cell(2, 2, "#FF0000")
+    game.place_cell(2, 3, "#FF0000")
+    # Block: four survivors
+    game.place_cell(7, 7, "#FF0000")
+    game.place_cell(7, 8, "#FF0000")
+    game.place_cell(8, 7, "#FF0000")
+    game.place_cell(8, 8, "#FF0000")
+
+    new_state = game.next_generation()
+
+    # Five survivors leave room for only one of the two births
+    assert len(new_state) == 6
+    assert {(2, 2), (7, 7), (7, 8), (8, 7), (8, 8)} < set(new_state)
+    assert len({(1, 2), (3, 2)} & set(new_state)) == 1
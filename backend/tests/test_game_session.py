@@ -0,0 +1,478 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from src.services.admission import SessionLimits  # noqa: E402
+from src.services.game_session import GameSession  # noqa: E402
+
+
+class FakeWebSocket:
+    # Starlette's WebSocket is unhashable, keep the fake the same
+    __hash__ = None
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.sent = []
+        self.fail = fail
+        self.delay = delay
+        self.closed = False
+
+    async def send_text(self, payload: str) -> None:
+        if self.fail:
+            raise RuntimeError("connection closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(payload))
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def types(self):
+        return [message["type"] for message in self.sent]
+
+
+async def drain() -> None:
+    """Let spectator writer tasks flush their queues."""
+    await asyncio.sleep(0.01)
+
+
+def fast_session() -> GameSession:
+    return GameSession(SessionLimits(base_tick_interval=0.01, max_tick_interval=0.01))
+
+
+def place_blinker(session: GameSession) -> None:
+    for x, y in [(2, 1), (2, 2), (2, 3)]:
+        session.game_loop.place_cell(x, y, "#FF0000")
+
+
+def place_glider(session: GameSession) -> None:
+    # Moves every generation, so it never returns to the same cells
+    for x, y in [(11, 10), (12, 11), (10, 12), (11, 12), (12, 12)]:
+        session.game_loop.place_cell(x, y, "#FF0000")
+
+
+def test_hidden_users_skipped_by_visible_only_broadcast():
+    """Test that hidden users only receive broadcasts not limited to viewers."""
+
+    async def scenario():
+        session = GameSession()
+        alice, bob = FakeWebSocket(), FakeWebSocket()
+        await session.add_user("alice", alice)
+        await session.add_user("bob", bob)
+        await session.handle_message("bob", {"type": "presence", "visible": False})
+        alice.sent.clear()
+
+        await session.broadcast({"type": "cell_update"}, visible_only=True)
+        await session.broadcast({"type": "user_list", "users": []})
+        session.stop_game_loop()
+        return alice, bob
+
+    alice, bob = asyncio.run(scenario())
+    assert alice.types() == ["cell_update", "user_list"]
+    assert "cell_update" not in bob.types()
+    assert bob.types()[-1] == "user_list"
+
+
+def test_visible_again_gets_full_update():
+    """Test that a user returning to the game is sent a catch-up snapshot."""
+
+    async def scenario():
+        session = fast_session()
+        alice = FakeWebSocket()
+        await session.add_user("alice", alice)
+        session.set_user_visibility("alice", False)
+        place_blinker(session)
+        alice.sent.clear()
+
+        session.set_user_visibility("alice", True)
+        await asyncio.sleep(0.05)
+        session.stop_game_loop()
+        return alice
+
+    alice = asyncio.run(scenario())
+    assert alice.types()[0] == "full_update"
+    assert len(alice.sent[0]["state"]) == 3
+    assert "full_update" not in alice.types()[1:]
+
+
+def test_presence_flood_sends_one_snapshot_per_tick():
+    """Test that toggling visibility cannot trigger a snapshot per message."""
+
+    async def scenario():
+        session = GameSession()
+        alice = FakeWebSocket()
+        spectator = FakeWebSocket()
+        await session.add_user("alice", alice)
+        await session.add_spectator(spectator)
+        await drain()
+        alice.sent.clear()
+        spectator.sent.clear()
+
+        for _ in range(50):
+            for visible in (False, True):
+                await session.handle_message(
+                    "alice", {"type": "presence", "visible": visible}
+                )
+                await session.handle_spectator_message(
+                    spectator, {"type": "presence", "visible": visible}
+                )
+        assert alice.sent == [] and spectator.sent == []
+
+        # What the game loop does at the end of each tick
+        await session._send_catch_up()
+        await session._send_catch_up()
+        await drain()
+        session.stop_game_loop()
+        return alice, spectator
+
+    alice, spectator = asyncio.run(scenario())
+    assert alice.types() == ["full_update"]
+    assert spectator.types() == ["full_update"]
+
+
+def test_loop_pauses_while_everyone_is_hidden():
+    """Test that the game loop stops stepping when nobody is watching."""
+
+    async def scenario():
+        session = fast_session()
+        await session.add_user("alice", FakeWebSocket())
+        await session.add_user("bob", FakeWebSocket())
+
+        session.set_user_visibility("alice", False)
+        assert session._viewers_present.is_set()
+        session.set_user_visibility("bob", False)
+        assert not session._viewers_present.is_set()
+
+        await asyncio.sleep(0.05)
+        place_glider(session)
+        paused_cells = dict(session.game_loop.cells)
+        await asyncio.sleep(0.05)
+        assert session.game_loop.cells == paused_cells
+
+        session.set_user_visibility("bob", True)
+        assert session._viewers_present.is_set()
+        await asyncio.sleep(0.05)
+        assert session.game_loop.cells != paused_cells
+        session.stop_game_loop()
+
+    asyncio.run(scenario())
+
+
+def test_edits_over_rate_are_dropped_with_one_notice():
+    """Test that the edit bucket drops excess placements and says so once."""
+
+    async def scenario():
+        session = GameSession(SessionLimits(edit_rate=0.001, edit_burst=3))
+        alice = FakeWebSocket()
+        await session.add_user("alice", alice)
+        alice.sent.clear()
+
+        for x in range(6):
+            await session.handle_message(
+                "alice", {"type": "place_cell", "x": x, "y": 0, "color": "#FF0000"}
+            )
+        session.stop_game_loop()
+        return session, alice
+
+    session, alice = asyncio.run(scenario())
+    assert len(session.game_loop.cells) == 3
+    assert alice.types() == ["cell_update"] * 3 + ["error"]
+
+
+def test_pulsar_fits_default_edit_burst():
+    """Test that the largest frontend pattern is not throttled by default."""
+
+    async def scenario():
+        session = GameSession()
+        await session.add_user("alice", FakeWebSocket())
+        for i in range(48):
+            await session.handle_message(
+                "alice",
+                {"type": "place_cell", "x": i % 13, "y": i // 13, "color": "#F00"},
+            )
+        session.stop_game_loop()
+        return session
+
+    assert len(asyncio.run(scenario()).game_loop.cells) == 48
+
+
+def test_live_cell_cap_blocks_new_placements():
+    """Test that placements beyond the live cell cap are dropped."""
+
+    async def scenario():
+        session = GameSession(SessionLimits(max_live_cells=2))
+        await session.add_user("alice", FakeWebSocket())
+        for x in range(4):
+            await session.handle_message(
+                "alice", {"type": "place_cell", "x": x, "y": 0, "color": "#FF0000"}
+            )
+        session.stop_game_loop()
+        return session
+
+    session = asyncio.run(scenario())
+    assert set(session.game_loop.cells) == {(0, 0), (1, 0)}
+    assert session._admit_edit("alice", 0, 0)
+    assert not session._admit_edit("alice", 5, 5)
+
+
+def test_tick_load_only_counts_watched_sessions():
+    """Test that tick_load reflects tick cost only while someone is watching."""
+
+    async def scenario():
+        session = GameSession()
+        await session.add_user("alice", FakeWebSocket())
+        session.tick_rate.average_duration = 0.1
+        watched = session.tick_load
+        session.set_user_visibility("alice", False)
+        hidden = session.tick_load
+        session.stop_game_loop()
+        return watched, hidden
+
+    watched, hidden = asyncio.run(scenario())
+    assert watched == pytest.approx(0.1)
+    assert hidden == 0.0
+
+
+def test_spectator_join_and_leave():
+    """Test that spectators get a snapshot but no username, color or list entry."""
+
+    async def scenario():
+        session = GameSession()
+        await session.add_user("alice", FakeWebSocket())
+        place_blinker(session)
+        spectator = FakeWebSocket()
+
+        await session.add_spectator(spectator)
+        await drain()
+        joined = (session.has_spectators(), list(session.users), session.user_colors)
+        session.remove_spectator(spectator)
+        session.stop_game_loop()
+        return session, spectator, joined
+
+    session, spectator, joined = asyncio.run(scenario())
+    assert joined == (True, ["alice"], {"alice": "#FF0000"})
+    # Joining messages first; the game loop may have ticked since
+    assert spectator.types()[:2] == ["full_update", "user_list"]
+    assert len(spectator.sent[0]["state"]) == 3
+    assert spectator.sent[1]["users"] == [{"username": "alice", "color": "#FF0000"}]
+    assert not session.has_spectators()
+
+
+def test_spectator_fan_out_drops_failed_sockets():
+    """Test that broadcasts reach every spectator and dead ones are removed."""
+
+    async def scenario():
+        session = GameSession()
+        spectators = [FakeWebSocket() for _ in range(50)]
+        for spectator in spectators:
+            await session.add_spectator(spectator)
+        broken = FakeWebSocket()
+        await session.add_spectator(broken)
+        await drain()
+        broken.fail = True
+
+        await session.broadcast({"type": "cell_update", "x": 1, "y": 1})
+        await drain()
+        return session, spectators, broken
+
+    session, spectators, broken = asyncio.run(scenario())
+    expected = {"type": "cell_update", "x": 1, "y": 1}
+    assert all(spectator.sent[-1] == expected for spectator in spectators)
+    assert len(session.spectators) == 50
+    assert id(broken) not in session.spectators
+    assert broken.closed
+
+
+def test_slow_spectator_does_not_block_others(monkeypatch):
+    """Test that a lagging spectator is dropped without stalling broadcasts."""
+    monkeypatch.setattr("src.services.game_session.SPECTATOR_QUEUE_SIZE", 3)
+
+    async def scenario():
+        session = GameSession()
+        fast = FakeWebSocket()
+        slow = FakeWebSocket(delay=10)
+        await session.add_spectator(fast)
+        await session.add_spectator(slow)
+        await drain()
+
+        loop = asyncio.get_running_loop()
+        slowest = 0.0
+        for x in range(5):
+            started = loop.time()
+            await session.broadcast({"type": "cell_update", "x": x, "y": 0})
+            slowest = max(slowest, loop.time() - started)
+            # Ticks are spaced out; let the writers run in between
+            await drain()
+        return session, fast, slow, slowest
+
+    session, fast, slow, slowest = asyncio.run(scenario())
+    assert slowest < 0.01
+    assert [m["x"] for m in fast.sent if m["type"] == "cell_update"] == [0, 1, 2, 3, 4]
+    assert id(slow) not in session.spectators
+    assert id(fast) in session.spectators
+    assert slow.closed
+
+
+def test_stalled_spectator_send_times_out(monkeypatch):
+    """Test that a spectator whose send never completes is dropped."""
+    monkeypatch.setattr("src.services.game_session.SPECTATOR_SEND_TIMEOUT", 0.02)
+
+    async def scenario():
+        session = GameSession()
+        stalled = FakeWebSocket(delay=10)
+        await session.add_spectator(stalled)
+        await asyncio.sleep(0.05)
+        return session, stalled
+
+    session, stalled = asyncio.run(scenario())
+    assert not session.has_spectators()
+    assert stalled.closed
+
+
+def test_hidden_spectators_pause_the_loop():
+    """Test that a backgrounded spectator stops diffs and the simulation."""
+
+    async def scenario():
+        session = fast_session()
+        spectator = FakeWebSocket()
+        await session.add_spectator(spectator)
+        await drain()
+        session.start_game_loop()
+
+        await session.handle_spectator_message(
+            spectator, {"type": "presence", "visible": False}
+        )
+        assert not session._viewers_present.is_set()
+        place_glider(session)
+        spectator.sent.clear()
+        await session.broadcast({"type": "cell_update"}, visible_only=True)
+        await asyncio.sleep(0.05)
+        assert spectator.sent == []
+
+        await session.handle_spectator_message(
+            spectator, {"type": "presence", "visible": True}
+        )
+        assert session._viewers_present.is_set()
+        await asyncio.sleep(0.05)
+        session.stop_game_loop()
+        return spectator
+
+    spectator = asyncio.run(scenario())
+    assert spectator.types()[0] == "full_update"
+    assert "cell_updates" in spectator.types()
+
+
+def test_user_list_is_debounced(monkeypatch):
+    """Test that a burst of joins and leaves produces a single broadcast."""
+    monkeypatch.setattr("src.services.game_session.USER_LIST_DEBOUNCE", 0.02)
+
+    async def scenario():
+        session = GameSession()
+        sockets = [FakeWebSocket() for _ in range(20)]
+        for i, websocket in enumerate(sockets):
+            await session.add_user(f"user{i}", websocket)
+        await session.remove_user("user19")
+        await asyncio.sleep(0.05)
+        session.stop_game_loop()
+        return sockets[0]
+
+    first = asyncio.run(scenario())
+    user_lists = [m for m in first.sent if m["type"] == "user_list"]
+    # The joining user's own copy, then one batched broadcast
+    assert len(user_lists) == 2
+    assert len(user_lists[0]["users"]) == 1
+    assert len(user_lists[1]["users"]) == 19
+
+
+def test_joining_user_gets_user_list_immediately():
+    """Test that a new user learns their color without waiting for the debounce."""
+
+    async def scenario():
+        session = GameSession()
+        await session.add_user("alice", FakeWebSocket())
+        bob = FakeWebSocket()
+        await session.add_user("bob", bob)
+        session.stop_game_loop()
+        return bob
+
+    bob = asyncio.run(scenario())
+    assert bob.types() == ["full_update", "user_list"]
+    assert {"username": "bob", "color": "#00FF00"} in bob.sent[1]["users"]
+
+
+def test_stop_game_loop_cancels_pending_user_list(monkeypatch):
+    """Test that a torn-down session does not broadcast a late user_list."""
+    monkeypatch.setattr("src.services.game_session.USER_LIST_DEBOUNCE", 0.02)
+
+    async def scenario():
+        session = GameSession()
+        alice = FakeWebSocket()
+        await session.add_user("alice", alice)
+        session.stop_game_loop()
+        await asyncio.sleep(0.05)
+        return alice
+
+    # Only the joining user's own copy, no late broadcast
+    assert asyncio.run(scenario()).types() == ["full_update", "user_list"]
+
+
+def test_reconnect_does_not_refill_edit_bucket():
+    """Test that leaving and rejoining keeps the user's edit rate limit."""
+
+    async def scenario():
+        session = GameSession(SessionLimits(edit_rate=0.001, edit_burst=3))
+        await session.add_user("bob", FakeWebSocket())
+        await session.add_user("alice", FakeWebSocket())
+        for x in range(3):
+            await session.handle_message(
+                "alice", {"type": "place_cell", "x": x, "y": 0, "color": "#FF0000"}
+            )
+
+        await session.remove_user("alice")
+        assert "alice" in session.edit_buckets
+        await session.add_user("alice", FakeWebSocket())
+        await session.handle_message(
+            "alice", {"type": "place_cell", "x": 9, "y": 9, "color": "#FF0000"}
+        )
+        session.stop_game_loop()
+        return session
+
+    session = asyncio.run(scenario())
+    assert (9, 9) not in session.game_loop.cells
+
+
+def test_full_edit_buckets_expire_after_leaving():
+    """Test that a departed user's bucket is dropped once it has refilled."""
+
+    async def scenario():
+        session = GameSession()
+        await session.add_user("alice", FakeWebSocket())
+        await session.add_user("bob", FakeWebSocket())
+        await session.handle_message(
+            "alice", {"type": "place_cell", "x": 1, "y": 1, "color": "#FF0000"}
+        )
+        session.edit_buckets["alice"].tokens = session.limits.edit_burst
+        await session.remove_user("alice")
+        session.stop_game_loop()
+        return session
+
+    assert "alice" not in asyncio.run(scenario()).edit_buckets
+
+
+@pytest.mark.parametrize("x, y", [([1], 0), (0, {"a": 1}), (1.5, 0), (True, 0)])
+def test_invalid_coordinates_rejected_at_cell_cap(x, y):
+    """Test that malformed coordinates are rejected before the cap lookup."""
+
+    async def scenario():
+        session = GameSession(SessionLimits(max_live_cells=1))
+        await session.add_user("alice", FakeWebSocket())
+        session.game_loop.place_cell(0, 0, "#FF0000")
+        await session.handle_message(
+            "alice", {"type": "place_cell", "x": x, "y": y, "color": "#FF0000"}
+        )
+        session.stop_game_loop()
+        return session
+
+    assert list(asyncio.run(scenario()).game_loop.cells) == [(0, 0)]
@@ -0,0 +1,124 @@
+import importlib
+import json
+import sys
+
+import pytest
+from src.services import message_encoder
+from src.services.game_loop import CellRemoval, CellUpdate
+from src.services.message_encoder import (
+    encode_cell_removals,
+    encode_cell_updates,
+    encode_full_update,
+    encode_message,
+)
+
+
+def test_encode_message():
+    """Test that generic messages round-trip through the encoder."""
+    message = {"type": "user_list", "users": [{"username": "a", "color": "#FF0000"}]}
+    assert json.loads(encode_message(message)) == message
+
+
+def test_encode_cell_updates():
+    """Test that cell updates are encoded like the dict-based payload."""
+    payload = encode_cell_updates(
+        [CellUpdate(1, 2, "#FF0000"), CellUpdate(3, 4, "#0A0B0C")]
+    )
+    assert json.loads(payload) == {
+        "type": "cell_updates",
+        "updates": [
+            {"x": 1, "y": 2, "color": "#FF0000"},
+            {"x": 3, "y": 4, "color": "#0A0B0C"},
+        ],
+    }
+
+
+def test_encode_cell_removals():
+    """Test that cell removals are encoded like the dict-based payload."""
+    payload = encode_cell_removals([CellRemoval(5, 6)])
+    assert json.loads(payload) == {
+        "type": "cell_removals",
+        "removals": [{"x": 5, "y": 6}],
+    }
+
+
+def test_encode_empty_full_update():
+    """Test that an empty board encodes to an empty state list."""
+    assert json.loads(encode_full_update({})) == {"type": "full_update", "state": []}
+
+
+def test_encode_full_update_normalizes_colors():
+    """Test that full updates match GameLoop.get_state, including color case."""
+    payload = encode_full_update({(1, 1): "#ff0000", (2, 3): "#00FF00"})
+    assert json.loads(payload)["state"] == [
+        {"x": 1, "y": 1, "color": "#FF0000"},
+        {"x": 2, "y": 3, "color": "#00FF00"},
+    ]
+
+
+def _stdlib(message):
+    return json.dumps(message, separators=(",", ":"))
+
+
+def test_cell_payloads_match_json_dumps():
+    """Test that hand-built payloads are byte-for-byte what json.dumps gives."""
+    updates = [CellUpdate(0, 0, "#FF0000"), CellUpdate(49, 29, "#0a0b0c")]
+    removals = [CellRemoval(3, 4), CellRemoval(10, 0)]
+    cells = {(1, 2): "#ff0000", (3, 4): "#00FF00"}
+
+    assert encode_cell_updates(updates) == _stdlib(
+        {
+            "type": "cell_updates",
+            "updates": [{"x": u.x, "y": u.y, "color": u.color} for u in updates],
+        }
+    )
+    assert encode_cell_removals(removals) == _stdlib(
+        {"type": "cell_removals", "removals": [{"x": r.x, "y": r.y} for r in removals]}
+    )
+    assert encode_full_update(cells) == _stdlib(
+        {
+            "type": "full_update",
+            "state": [
+                {"x": x, "y": y, "color": color.upper()}
+                for (x, y), color in cells.items()
+            ],
+        }
+    )
+    assert encode_cell_updates([]) == _stdlib({"type": "cell_updates", "updates": []})
+
+
+def test_cell_payloads_always_encode_integer_coordinates():
+    """Test that non-int coordinates never leak Python literals into JSON."""
+    payload = encode_full_update({(True, 0): "#FF0000"})
+    assert json.loads(payload)["state"] == [{"x": 1, "y": 0, "color": "#FF0000"}]
+
+    with pytest.raises(ValueError):
+        encode_cell_removals([CellRemoval(1.5, 0)])
+
+
+def test_stdlib_backend():
+    """Test the stdlib fallback used when orjson is not installed."""
+    message = {"type": "error", "message": "Server is at capacity"}
+    assert message_encoder._stdlib_dumps(message) == _stdlib(message)
+
+
+def test_falls_back_to_stdlib_without_orjson(monkeypatch):
+    """Test that the encoder selects stdlib json when orjson cannot be imported."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    try:
+        fallback = importlib.reload(message_encoder)
+        assert fallback.JSON_BACKEND == "json"
+        message = {"type": "user_list", "users": []}
+        assert fallback.encode_message(message) == _stdlib(message)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(message_encoder)
+
+
+def test_orjson_backend():
+    """Test that the orjson backend is selected and matches stdlib json."""
+    pytest.importorskip("orjson")
+    message = {"type": "user_list", "users": [{"username": "é", "color": "#FF0000"}]}
+    assert json.loads(message_encoder._orjson_dumps(message)) == message
+    assert message_encoder.JSON_BACKEND == "orjson"
+    assert message_encoder._dumps is message_encoder._orjson_dumps
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from src.services.admission import AdmissionController, AdmissionError  # noqa: E402
+from src.services.websocket_service import WebSocketService  # noqa: E402
+
+
+def test_total_load_sums_session_tick_load():
+    """Test that the process load is the sum of every running session's load."""
+
+    async def scenario():
+        service = WebSocketService()
+        for load in (0.1, 0.25):
+            _, session = service.get_or_create_session("new")
+            session.start_game_loop()
+            session._viewers_present.set()
+            session.tick_rate.average_duration = load
+        total = service.total_load()
+        for code in list(service.sessions):
+            service.remove_session(code)
+        return total
+
+    assert asyncio.run(scenario()) == pytest.approx(0.35)
+
+
+def test_new_session_refused_over_session_limit():
+    """Test that get_or_create_session refuses new sessions past max_sessions."""
+    service = WebSocketService(AdmissionController(max_sessions=1))
+    code, session = service.get_or_create_session("new")
+
+    with pytest.raises(AdmissionError):
+        service.get_or_create_session("new")
+
+    # Existing sessions can still be joined
+    assert service.get_or_create_session(code) == (code, session)
+    assert len(service.sessions) == 1
+
+
+def test_new_session_refused_over_load_limit():
+    """Test that get_or_create_session refuses new sessions past max_load."""
+
+    async def scenario():
+        service = WebSocketService(AdmissionController(max_load=0.5))
+        _, session = service.get_or_create_session("new")
+        session.start_game_loop()
+        session._viewers_present.set()
+        session.tick_rate.average_duration = 0.6
+
+        with pytest.raises(AdmissionError):
+            service.get_or_create_session("new")
+        session.stop_game_loop()
+
+    asyncio.run(scenario())
@@ -4,6 +4,7 @@ export interface GameState {
     users: { username: string; color: string }[];
     channelCode: string;
     username: string;
+    spectating: boolean;
     gridWidth: number;
     gridHeight: number;
 }
@@ -14,6 +15,7 @@ export const gameState = writable<GameState>({
     users: [],
     channelCode: '',
     username: '',
+    spectating: false,
     gridWidth: 50,
     gridHeight: 30
 });
@@ -34,15 +36,40 @@ interface WebSocketMessage {
 class WebSocketService {
     private ws: WebSocket | null = null;
 
+    private handleVisibilityChange = (): void => {
+        this.sendPresence(!document.hidden);
+    };
+
     connect(username: string, channelCode: string): Promise<string> {
+        return this.open(`/ws/${channelCode || 'new'}/${username}`, username, channelCode, false);
+    }
+
+    // Read-only connection: no username, and the channel must already exist
+    watch(channelCode: string): Promise<string> {
+        return this.open(`/watch/${channelCode}`, '', channelCode, true);
+    }
+
+    private open(
+        path: string,
+        username: string,
+        channelCode: string,
+        spectating: boolean
+    ): Promise<string> {
         return new Promise((resolve) => {
             const backendUrl = import.meta.env.VITE_BACKEND_WS_URL || 'ws://localhost:8000';
-            const wsUrl = `${backendUrl}/ws/${channelCode || 'new'}/${username}`;
+            const wsUrl = `${backendUrl}${path}`;
 
-            this.ws = new WebSocket(wsUrl);
+            // Drop any previous connection (and its visibility listener) first
+            this.disconnect();
+            const socket = new WebSocket(wsUrl);
+            this.ws = socket;
 
             this.ws.onopen = async () => {
-                gameState.update((state) => ({ ...state, username }));
+                gameState.update((state) => ({ ...state, username, spectating }));
+                document.addEventListener('visibilitychange', this.handleVisibilityChange);
+                if (document.hidden) {
+                    this.sendPresence(false);
+                }
             };
 
             this.ws.onmessage = (event) => {
@@ -80,6 +107,11 @@ class WebSocketService {
                             newState[`${x},${y}`] = color;
                         });
                         cells.set(newState);
+                        // Spectators are not sent a channel code, the snapshot means joined
+                        if (spectating) {
+                            gameState.update((state) => ({ ...state, channelCode }));
+                            resolve(channelCode);
+                        }
                         break;
                     case 'channel_code':
                         const code = data.code;
@@ -100,6 +132,14 @@ class WebSocketService {
                 }
             };
 
+            this.ws.onclose = () => {
+                // A replaced socket closing must not unhook the current one
+                if (this.ws === socket) {
+                    document.removeEventListener('visibilitychange', this.handleVisibilityChange);
+                }
+                resolve(''); // No-op if already resolved, e.g. refused before joining
+            };
+
             this.ws.onerror = () => {
                 resolve(''); // Resolve with empty string on error
             };
@@ -114,6 +154,9 @@ class WebSocketService {
 
     placeCell(x: number, y: number): void {
         const currentGameState = get(gameState);
+        if (currentGameState.spectating) {
+            return;
+        }
         this.sendMessage({
             type: 'place_cell',
             x,
@@ -123,7 +166,12 @@ class WebSocketService {
         });
     }
 
+    sendPresence(visible: boolean): void {
+        this.sendMessage({ type: 'presence', visible });
+    }
+
     disconnect(): void {
+        document.removeEventListener('visibilitychange', this.handleVisibilityChange);
         if (this.ws) {
             this.ws.close();
             this.ws = null;